@@ -3,9 +3,7 @@ import re
 import os
 import sys
 import datetime
-import glob
 import click
-from openstates import metadata
 from enum import Enum, auto
 from utils import (
     get_data_dir,
@@ -17,6 +15,8 @@ from utils import (
     MAJOR_PARTIES,
 )
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 
 class BadVacancy(Exception):
@@ -31,19 +31,15 @@ class PersonType(Enum):
 
 
 SUFFIX_RE = re.compile(r"(iii?)|(i?v)|((ed|ph|m|o)\.?d\.?)|([sj]r\.?)|(esq\.?)", re.I)
-DATE_RE = re.compile(r"^\d{4}(-\d{2}(-\d{2})?)?$")
-PHONE_RE = re.compile(r"^(1-)?\d{3}-\d{3}-\d{4}( ext. \d+)?$")
-UUID_RE = re.compile(r"^ocd-\w+/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+DATE_RE = re.compile(r"\d{4}(-\d{2}(-\d{2})?)?")
+PHONE_RE = re.compile(r"(1-)?\d{3}-\d{3}-\d{4}( ext\. \d+)?")
+UUID_RE = re.compile(r"ocd-\w+/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
 JURISDICTION_RE = re.compile(
     r"ocd-jurisdiction/country:us/(state|district|territory):\w\w/((place|county):[a-z_]+/)?government"
 )
 LEGACY_OS_ID_RE = re.compile(r"[A-Z]{2}L\d{6}")
 
 
-class Missing:
-    pass
-
-
 class Required:
     pass
 
@@ -72,7 +68,7 @@ def no_bad_comma(val):
     elif len(pieces) > 2:
         return False  # too many commas for a suffix
     else:
-        return bool(SUFFIX_RE.findall(pieces[1]))
+        return SUFFIX_RE.search(pieces[1]) is not None
 
 
 def is_url(val):
@@ -85,39 +81,42 @@ def is_social(val):
 
 class Enum:
     def __init__(self, *values):
-        self.values = values
+        self.values = frozenset(values)
+        # for display
+        self.__name__ = f"Enum{values}"
 
     def __call__(self, val):
         return is_string(val) and val in self.values
 
-    # for display
-    @property
-    def __name__(self):
-        return f"Enum{self.values}"
-
 
 def is_fuzzy_date(val):
-    return isinstance(val, datetime.date) or (is_string(val) and DATE_RE.match(val))
+    return isinstance(val, datetime.date) or (
+        is_string(val) and DATE_RE.fullmatch(val) is not None
+    )
 
 
 def is_phone(val):
-    return is_string(val) and PHONE_RE.match(val)
+    return is_string(val) and PHONE_RE.fullmatch(val) is not None
 
 
 def is_ocd_jurisdiction(val):
-    return is_string(val) and JURISDICTION_RE.match(val)
+    return is_string(val) and JURISDICTION_RE.match(val) is not None
 
 
 def is_ocd_person(val):
-    return is_string(val) and val.startswith("ocd-person/") and UUID_RE.match(val)
+    return is_string(val) and val.startswith("ocd-person/") and UUID_RE.fullmatch(val) is not None
 
 
 def is_ocd_organization(val):
-    return is_string(val) and val.startswith("ocd-organization/") and UUID_RE.match(val)
+    return (
+        is_string(val)
+        and val.startswith("ocd-organization/")
+        and UUID_RE.fullmatch(val) is not None
+    )
 
 
 def is_legacy_openstates(val):
-    return is_string(val) and LEGACY_OS_ID_RE.match(val)
+    return is_string(val) and LEGACY_OS_ID_RE.match(val) is not None
 
 
 URL_LIST = NestedList({"note": [is_string], "url": [is_url, Required]})
@@ -235,69 +234,68 @@ PERSON_FIELDS = {
 }
 
 
-def validate_obj(obj, schema, prefix=None):
+def validate_obj(obj, schema, prefix_str=""):
+    """
+    validate obj against schema, returning a list of error strings
+
+    prefix_str is prepended to field names in errors, e.g. "links.0."
+    """
     errors = []
 
-    if prefix:
-        prefix_str = ".".join(prefix) + "."
-    else:
-        prefix_str = ""
+    if not isinstance(obj, dict):
+        raise ValueError(f"{prefix_str} is not a dictionary")
 
     for field, validators in schema.items():
-        if not isinstance(obj, dict):
-            raise ValueError(f"{prefix_str} is not a dictionary")
-            continue
-        value = obj.get(field, Missing)
-
-        if value is Missing:
+        if field not in obj:
             if isinstance(validators, list) and Required in validators:
                 errors.append(f"{prefix_str}{field} missing")
             # error or not, don't run other validators against missing fields
             continue
+        value = obj[field]
 
         if isinstance(validators, list):
             for validator in validators:
                 # required is checked above
-                if validator is Required:
-                    continue
-                if not validator(value):
+                if validator is not Required and not validator(value):
                     errors.append(
                         f"{prefix_str}{field} failed validation {validator.__name__}: {value}"
                     )
         elif isinstance(validators, dict):
-            errors.extend(validate_obj(value, validators, [field]))
+            errors.extend(validate_obj(value, validators, f"{field}."))
         elif isinstance(validators, NestedList):
             if isinstance(validators.subschema, dict):
                 # validate list elements against child schema
                 for index, item in enumerate(value):
-                    errors.extend(validate_obj(item, validators.subschema, [field, str(index)]))
+                    errors.extend(validate_obj(item, validators.subschema, f"{field}.{index}."))
             else:
                 # subschema can also be a validation function
                 for index, item in enumerate(value):
-                    errors.extend(
-                        [
-                            ".".join([field, str(index)]) + ": " + e
-                            for e in validators.subschema(item)
-                        ]
-                    )
+                    errors.extend(f"{field}.{index}: {e}" for e in validators.subschema(item))
         else:  # pragma: no cover
             raise ValueError("invalid schema {}".format(validators))
 
     # check for extra items that went without validation
-    for key in set(obj.keys()) - set(schema.keys()):
-        errors.append(f"extra key: {prefix_str}{key}")
+    for key in obj:
+        if key not in schema:
+            errors.append(f"extra key: {prefix_str}{key}")
 
     return errors
 
 
 def validate_roles(person, roles_key, retired=False, date=None):
-    active = [role for role in person.get(roles_key, []) if role_is_active(role, date=date)]
-    if len(active) == 0 and not retired:
+    active = 0
+    for role in person.get(roles_key, []):
+        if role_is_active(role, date=date):
+            active += 1
+            # only roles report how many are active, anything else can stop at the first
+            if roles_key != "roles":
+                break
+    if active == 0 and not retired:
         return [f"no active {roles_key}"]
-    elif roles_key == "roles" and retired and len(active) > 0:
-        return [f"{len(active)} active roles on retired person"]
-    elif roles_key == "roles" and len(active) > 1:
-        return [f"{len(active)} active roles"]
+    elif roles_key == "roles" and retired and active > 0:
+        return [f"{active} active roles on retired person"]
+    elif roles_key == "roles" and active > 1:
+        return [f"{active} active roles"]
     return []
 
 
@@ -312,12 +310,13 @@ def validate_offices(person):
             if key == "note":
                 continue
             # reverse lookup to see if we've used this phone number/etc. before
-            location_str = f"{office['note']} {key}"
             if value in seen_values:
+                seen_note, seen_key = seen_values[value]
                 errors.append(
-                    f"Value '{value}' used multiple times: {seen_values[value]} and {location_str}"
+                    f"Value '{value}' used multiple times: {seen_note} {seen_key} "
+                    f"and {office['note']} {key}"
                 )
-            seen_values[value] = location_str
+            seen_values[value] = (office["note"], key)
     # if type_counter["District Office"] > 1:
     #     errors.append("Multiple district offices.")
     if type_counter["Capitol Office"] > 1:
@@ -325,20 +324,29 @@ def validate_offices(person):
     return errors
 
 
+@lru_cache(maxsize=None)
+def lookup_jurisdiction(jid):
+    from openstates import metadata
+
+    try:
+        return metadata.lookup(jurisdiction_id=jid)
+    except KeyError:
+        return None
+
+
 def validate_jurisdictions(person, municipalities):
     errors = []
     for role in person.get("roles", []):
         jid = role.get("jurisdiction")
-        try:
-            state = metadata.lookup(jurisdiction_id=jid)
-        except KeyError:
-            state = None
+        state = lookup_jurisdiction(jid)
         if jid and (not state and jid not in municipalities):
             errors.append(f"{jid} is not a valid jurisdiction_id")
     return errors
 
 
 def get_expected_districts(settings, abbr):
+    from openstates import metadata
+
     expected = {}
 
     state = metadata.lookup(abbr=abbr)
@@ -366,9 +374,17 @@ def get_expected_districts(settings, abbr):
     return expected
 
 
-def compare_districts(expected, actual):
+def compare_districts(expected, actual_by_seat):
+    """
+    expected maps chamber -> district -> number of seats,
+    actual_by_seat maps (chamber, district) -> filenames of active legislators
+    """
     errors = []
 
+    actual = defaultdict(dict)
+    for (chamber, district), filenames in actual_by_seat.items():
+        actual[chamber][district] = filenames
+
     if expected.keys() != actual.keys():
         errors.append(f"expected districts for {expected.keys()}, got {actual.keys()}")
         return errors
@@ -397,67 +413,91 @@ class Validator:
         self.valid_parties = set(settings["parties"])
         self.errors = defaultdict(list)
         self.warnings = defaultdict(list)
-        # role type -> district -> filename
-        self.active_legislators = defaultdict(lambda: defaultdict(list))
-        # field name -> value -> filename
-        self.duplicate_values = defaultdict(lambda: defaultdict(list))
+        # (role type, district) -> filename
+        self.active_legislators = defaultdict(list)
+        # (field name, value) -> filename
+        self.duplicate_values = defaultdict(list)
         self.legacy_districts = legacy_districts(abbr=abbr)
-        self.municipalities = [m["id"] for m in load_municipalities(abbr=abbr)]
+        self.municipalities = frozenset(m["id"] for m in load_municipalities(abbr=abbr))
         for m in self.municipalities:
             if not JURISDICTION_RE.match(m):
                 raise ValueError(f"invalid municipality id {m}")
 
     def validate_person(self, person, filename, person_type, date=None):
-        self.errors[filename] = validate_obj(person, PERSON_FIELDS)
+        self.record_person(filename, *self.check_person(person, filename, person_type, date))
+
+    def check_person(self, person, filename, person_type, date=None):
+        """
+        run all per-person checks without modifying the validator's state
+
+        returns (errors, warnings, ids, active_role) for record_person, which allows
+        the checks to run in a worker process
+        """
+        # resolve dates once rather than in every role_is_active call
+        today = datetime.datetime.utcnow().date().isoformat()
+        if date is None:
+            date = today
+
+        errors = validate_obj(person, PERSON_FIELDS)
+        warnings = []
         uid = person["id"].split("/")[1]
         if uid not in filename:
-            self.errors[filename].append(f"id piece {uid} not in filename")
-        self.errors[filename].extend(validate_jurisdictions(person, self.municipalities))
-        self.errors[filename].extend(
+            errors.append(f"id piece {uid} not in filename")
+        errors.extend(validate_jurisdictions(person, self.municipalities))
+        errors.extend(
             validate_roles(person, "roles", person_type == PersonType.RETIRED, date=date)
         )
         if person_type in (PersonType.LEGISLATIVE, PersonType.EXECUTIVE):
-            self.errors[filename].extend(validate_roles(person, "party"))
+            errors.extend(validate_roles(person, "party", date=today))
 
-        self.errors[filename].extend(validate_offices(person))
+        errors.extend(validate_offices(person))
 
         # active party validation
         active_parties = []
         for party in person.get("party", []):
             if party["name"] not in self.valid_parties:
-                self.errors[filename].append(f"invalid party {party['name']}")
-            if role_is_active(party):
+                errors.append(f"invalid party {party['name']}")
+            if role_is_active(party, date=today):
                 active_parties.append(party["name"])
         if len(active_parties) > 1:
             if len([party for party in active_parties if party in MAJOR_PARTIES]) > 1:
-                self.errors[filename].append(
-                    f"multiple active major party memberships {active_parties}"
-                )
+                errors.append(f"multiple active major party memberships {active_parties}")
             else:
-                self.warnings[filename].append(
-                    f"multiple active party memberships {active_parties}"
-                )
+                warnings.append(f"multiple active party memberships {active_parties}")
 
         # TODO: this was too ambitious, disabling this for now
-        # self.warnings[filename] = self.check_https(person)
+        # warnings = self.check_https(person)
         if person_type == PersonType.RETIRED:
-            self.errors[filename].extend(self.validate_old_district_names(person))
+            errors.extend(self.validate_old_district_names(person))
 
-        # check duplicate IDs
-        for scheme, value in person.get("ids", {}).items():
-            self.duplicate_values[scheme][value].append(filename)
+        # collect IDs for duplicate check
+        ids = list(person.get("ids", {}).items())
         for id in person.get("other_identifiers", []):
-            self.duplicate_values[id["scheme"]][id["identifier"]].append(filename)
+            ids.append((id["scheme"], id["identifier"]))
 
-        # update active legislators
+        # find active legislative seat
+        active_role = None
         if person_type == PersonType.LEGISLATIVE:
-            role_type = district = None
+            active_role = (None, None)
             for role in person.get("roles", []):
                 if role_is_active(role, date=date):
-                    role_type = role["type"]
-                    district = role.get("district")
+                    active_role = (role["type"], role.get("district"))
                     break
-            self.active_legislators[role_type][district].append(filename)
+
+        return errors, warnings, ids, active_role
+
+    def record_person(self, filename, errors, warnings, ids, active_role):
+        self.errors[filename] = errors
+        if warnings:
+            self.warnings[filename].extend(warnings)
+
+        # check duplicate IDs
+        for scheme, value in ids:
+            self.duplicate_values[scheme, value].append(filename)
+
+        # update active legislators
+        if active_role:
+            self.active_legislators[active_role].append(filename)
 
     def validate_old_district_names(self, person):
         errors = []
@@ -495,22 +535,21 @@ class Validator:
         this method just needs to turn them into errors
         """
         errors = []
-        for key, values in self.duplicate_values.items():
-            for value, instances in values.items():
-                if len(instances) > 1:
-                    if len(instances) > 3:
-                        instance_str = ", ".join(instances[:3])
-                        instance_str += " and {} more...".format(len(instances) - 3)
-                    else:
-                        instance_str = ", ".join(instances)
-                    errors.append(f'duplicate {key}: "{value}" {instance_str}')
+        for (key, value), instances in self.duplicate_values.items():
+            if len(instances) > 1:
+                if len(instances) > 3:
+                    instance_str = ", ".join(instances[:3])
+                    instance_str += " and {} more...".format(len(instances) - 3)
+                else:
+                    instance_str = ", ".join(instances)
+                errors.append(f'duplicate {key}: "{value}" {instance_str}')
         return errors
 
     def print_validation_report(self, verbose):  # pragma: no cover
         error_count = 0
 
         for fn, errors in self.errors.items():
-            warnings = self.warnings[fn]
+            warnings = self.warnings.get(fn, [])
             if errors or warnings:
                 click.echo(fn)
                 for err in errors:
@@ -533,15 +572,40 @@ class Validator:
         return error_count
 
 
-def process_dir(abbr, verbose, municipal, date):  # pragma: no cover
-    legislative_filenames = glob.glob(os.path.join(get_data_dir(abbr), "legislature", "*.yml"))
-    executive_filenames = glob.glob(os.path.join(get_data_dir(abbr), "executive", "*.yml"))
-    municipality_filenames = glob.glob(os.path.join(get_data_dir(abbr), "municipalities", "*.yml"))
-    retired_filenames = glob.glob(os.path.join(get_data_dir(abbr), "retired", "*.yml"))
+def _yml_files(dirname):  # pragma: no cover
+    try:
+        with os.scandir(dirname) as entries:
+            return [e.path for e in entries if e.name.endswith(".yml") and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+# validator shared by each worker process, set by _init_worker
+_worker_validator = None
+
+
+def _init_worker(validator):  # pragma: no cover
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _lint_one(args):  # pragma: no cover
+    filename, person_type, date = args
+    print_filename = os.path.basename(filename)
+    with open(filename) as f:
+        person = load_yaml(f)
+    return (print_filename,) + _worker_validator.check_person(
+        person, print_filename, person_type, date
+    )
+
+
+def process_dir(abbr, verbose, municipal, date, settings):  # pragma: no cover
+    data_dir = get_data_dir(abbr)
+    legislative_filenames = _yml_files(os.path.join(data_dir, "legislature"))
+    executive_filenames = _yml_files(os.path.join(data_dir, "executive"))
+    municipality_filenames = _yml_files(os.path.join(data_dir, "municipalities"))
+    retired_filenames = _yml_files(os.path.join(data_dir, "retired"))
 
-    settings_file = os.path.join(os.path.dirname(__file__), "../settings.yml")
-    with open(settings_file) as f:
-        settings = load_yaml(f)
     try:
         validator = Validator(abbr, settings)
     except BadVacancy:
@@ -556,12 +620,16 @@ def process_dir(abbr, verbose, municipal, date):  # pragma: no cover
     if municipal:
         all_filenames.append((PersonType.MUNICIPAL, municipality_filenames))
 
-    for person_type, filenames in all_filenames:
-        for filename in filenames:
-            print_filename = os.path.basename(filename)
-            with open(filename) as f:
-                person = load_yaml(f)
-                validator.validate_person(person, print_filename, person_type, date)
+    tasks = [
+        (filename, person_type, date)
+        for person_type, filenames in all_filenames
+        for filename in filenames
+    ]
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(), initializer=_init_worker, initargs=(validator,)
+    ) as executor:
+        for print_filename, *results in executor.map(_lint_one, tasks, chunksize=32):
+            validator.record_person(print_filename, *results)
 
     error_count = validator.print_validation_report(verbose)
 
@@ -588,9 +656,13 @@ def lint(abbreviations, verbose, municipal, date):
     if not abbreviations:
         abbreviations = get_all_abbreviations()
 
+    settings_file = os.path.join(os.path.dirname(__file__), "../settings.yml")
+    with open(settings_file) as f:
+        settings = load_yaml(f)
+
     for abbr in abbreviations:
         click.secho("==== {} ====".format(abbr), bold=True)
-        error_count += process_dir(abbr, verbose, municipal, date)
+        error_count += process_dir(abbr, verbose, municipal, date, settings)
 
     if error_count:
         click.secho(f"exiting with {error_count} errors", fg="red")
@@ -12,11 +12,18 @@ def fix_offices(filename):
     with open(filename) as file:
         data = load_yaml(file)
 
+    offices = data.get("contact_details", [])
+    if not offices or (
+        len(offices) == 1 and "email" not in offices[0] and next(iter(offices[0])) == "note"
+    ):
+        # nothing to merge or reorder, skip rewriting the file
+        return
+
     # office_type -> key -> set of values seen
     all_details = defaultdict(lambda: defaultdict(set))
     email = set()
 
-    for office in data.get("contact_details", []):
+    for office in offices:
         for key, value in office.items():
             if key == "note":
                 continue
@@ -59,6 +66,7 @@ def fix_offices(filename):
             error = True
 
     if not error:
+        before_email = data.get("email")
         if email:
             data["email"] = email
         data["contact_details"] = []
@@ -66,7 +74,8 @@ def fix_offices(filename):
             if otype in reformatted:
                 data["contact_details"].append(OrderedDict(note=otype, **reformatted[otype]))
         # click.echo(f"rewrite contact details as {data['contact_details']}")
-        dump_obj(data, filename=filename)
+        if data["contact_details"] != offices or data.get("email") != before_email:
+            dump_obj(data, filename=filename)
 
 
 def fix_offices_state(state):
@@ -8,10 +8,12 @@ from lint_yaml import (
     is_ocd_person,
     is_legacy_openstates,
     no_bad_comma,
+    Enum,
     validate_obj,
     PERSON_FIELDS,
     validate_roles,
     validate_offices,
+    validate_jurisdictions,
     get_expected_districts,
     compare_districts,
     Validator,
@@ -37,6 +39,7 @@ def test_is_fuzzy_date():
     assert is_fuzzy_date("2019-01")
     assert is_fuzzy_date("2020-01-01")
     assert not is_fuzzy_date("1/1/2011")
+    assert not is_fuzzy_date("2020-1-01")
 
 
 def test_is_phone():
@@ -44,6 +47,15 @@ def test_is_phone():
     assert is_phone("1-123-346-7990")
     assert is_phone("1-123-346-7990 ext. 123")
     assert not is_phone("(123) 346-7990")
+    assert not is_phone("1-123-346-7990 extn 123")
+
+
+def test_enum():
+    office = Enum("District Office", "Capitol Office")
+    assert office("District Office")
+    assert not office("Home Office")
+    assert not office(["District Office"])
+    assert office.__name__ == "Enum('District Office', 'Capitol Office')"
 
 
 def test_no_bad_comma():
@@ -63,6 +75,7 @@ def test_is_ocd_person():
     assert is_ocd_person("ocd-person/abcdef98-0123-7777-8888-1234567890ab")
     assert not is_ocd_person("abcdef98-0123-7777-8888-1234567890ab")
     assert not is_ocd_person("ocd-person/abcdef980123777788881234567890ab")
+    assert not is_ocd_person("ocd-person/ABCDEF98-0123-7777-8888-1234567890ab")
 
 
 def test_is_legacy_openstates():
@@ -214,6 +227,26 @@ def test_validate_offices(person, expected):
     assert validate_offices(person) == expected
 
 
+@pytest.mark.parametrize(
+    "jid,expected",
+    [
+        ("ocd-jurisdiction/country:us/state:ak/government", []),
+        ("ocd-jurisdiction/country:us/state:ak/place:anchorage/government", []),
+        (
+            "ocd-jurisdiction/country:us/state:ak/place:nowhere/government",
+            [
+                "ocd-jurisdiction/country:us/state:ak/place:nowhere/government "
+                "is not a valid jurisdiction_id"
+            ],
+        ),
+    ],
+)
+def test_validate_jurisdictions(jid, expected):
+    municipalities = frozenset(["ocd-jurisdiction/country:us/state:ak/place:anchorage/government"])
+    person = {"roles": [{"jurisdiction": jid}]}
+    assert validate_jurisdictions(person, municipalities) == expected
+
+
 @pytest.mark.parametrize(
     "person,expected",
     [
@@ -280,14 +313,15 @@ def test_expected_districts_vacancies():
     ],
 )
 def test_compare_districts(expected, actual, errors):
-    e = compare_districts({"upper": expected}, {"upper": actual})
+    actual = {("upper", district): people for district, people in actual.items()}
+    e = compare_districts({"upper": expected}, actual)
     assert len(e) == errors
 
 
 def test_compare_districts_overfill():
     expected = {"A": 1}
-    actual = {"A": ["Anne", "Bob"]}
-    e = compare_districts({"upper": expected}, {"upper": actual})
+    actual = {("upper", "A"): ["Anne", "Bob"]}
+    e = compare_districts({"upper": expected}, actual)
     assert len(e) == 1
     assert "Anne" in e[0]
     assert "Bob" in e[0]
@@ -7,11 +7,26 @@ import yaml
 import yamlordereddictloader
 from collections import defaultdict
 from yaml.representer import Representer
-from openstates import metadata
+
+try:
+    from yaml import CSafeLoader as BaseSafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as BaseSafeLoader
 
 # set up defaultdict representation
 yaml.add_representer(defaultdict, Representer.represent_dict)
 
+
+class OrderedSafeLoader(BaseSafeLoader):
+    """ same as yamlordereddictloader.SafeLoader, but uses libyaml when available """
+
+    construct_yaml_map = yamlordereddictloader.construct_yaml_map
+    construct_mapping = yamlordereddictloader.construct_mapping
+
+
+OrderedSafeLoader.add_constructor("tag:yaml.org,2002:map", OrderedSafeLoader.construct_yaml_map)
+OrderedSafeLoader.add_constructor("tag:yaml.org,2002:omap", OrderedSafeLoader.construct_yaml_map)
+
 # can only have one of these at a time
 MAJOR_PARTIES = ("Democratic", "Republican", "Independent")
 
@@ -63,11 +78,13 @@ def get_all_abbreviations():
 
 
 def get_jurisdiction_id(abbr):
+    from openstates import metadata
+
     return metadata.lookup(abbr=abbr).jurisdiction_id
 
 
 def load_yaml(file_obj):
-    return yaml.load(file_obj, Loader=yamlordereddictloader.SafeLoader)
+    return yaml.load(file_obj, Loader=OrderedSafeLoader)
 
 
 def iter_objects(abbr, objtype):
@@ -117,6 +134,8 @@ def find_file(leg_id, *, state="*"):
 
 def legacy_districts(**kwargs):
     """ can take jurisdiction_id or abbr via kwargs """
+    from openstates import metadata
+
     legacy_districts = {"upper": [], "lower": []}
     for d in metadata.lookup(**kwargs).legacy_districts:
         legacy_districts[d.chamber_type].append(d.name)